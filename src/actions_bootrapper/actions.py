@@ -1,4 +1,6 @@
+import functools
 import os
+import shutil
 import socket
 import subprocess
 import sys
@@ -7,10 +9,17 @@ import urllib.parse
 from pathlib import Path
 
 import black
+import orjson
 import sema4ai_http
 from sema4ai.actions import Response, action
 from urllib3.exceptions import ConnectionError
 
+# Root folder of all bootstrapped action packages, resolved once at import
+_BOOTSTRAP_ROOT = Path(os.path.expanduser("~")) / "actions_bootstrapper"
+
+# Resolved once so bootstrapping does not search PATH on every call
+_ACTION_SERVER_EXECUTABLE = shutil.which("action-server") or "action-server"
+
 
 
 
@@ -25,21 +34,44 @@ def bootstrap_action_package(action_package_name: str) -> Response[str]:
     Returns:
         The full path of the bootstrapped action package.
     """
-    home_directory = os.path.expanduser("~")
-
-    new_action_package_path = os.path.join(home_directory, "actions_bootstrapper")
+    os.makedirs(_BOOTSTRAP_ROOT, exist_ok=True)
 
-    os.makedirs(new_action_package_path, exist_ok=True)
-
-    command = f"action-server new --name '{action_package_name}' --template basic"
-    subprocess.run(command, shell=True, cwd=new_action_package_path)
+    command = [
+        _ACTION_SERVER_EXECUTABLE,
+        "new",
+        "--name",
+        action_package_name,
+        "--template",
+        "basic",
+    ]
+    # Exec action-server directly rather than through /bin/sh
+    try:
+        completed = subprocess.run(command, cwd=_BOOTSTRAP_ROOT)
+    except FileNotFoundError:
+        return Response(
+            error="'action-server' command not found. Make sure it is installed and in your PATH."
+        )
 
     full_action_path = get_action_package_path(action_package_name)
 
+    if completed.returncode != 0 or not os.path.isdir(full_action_path):
+        return Response(
+            error=f"Failed to bootstrap action package '{action_package_name}': "
+            f"action-server new exited with status {completed.returncode}."
+        )
+
     # SMASH MORE UPDATES INTO BOOTSTRAP!
-    update_action_package_dependencies(action_package_name, action_package_dependencies_code="")
-    update_action_code(action_package_name, action_code="")  
-    update_action_package_action_dev_data(action_package_name, "", "")
+    # Reset package.yaml, actions.py and the devdata input in one pass instead of
+    # round-tripping through each update action (and black) with empty content.
+    dev_data_path = os.path.join(full_action_path, "devdata")
+    os.makedirs(dev_data_path, exist_ok=True)
+
+    for file_path in (
+        os.path.join(full_action_path, "package.yaml"),
+        os.path.join(full_action_path, "actions.py"),
+        os.path.join(dev_data_path, "input_.json"),
+    ):
+        _write_file(file_path, "")
 
     return Response(
         result=f"Action successfully bootstrapped! Code available at {full_action_path}"
@@ -48,8 +80,10 @@ def bootstrap_action_package(action_package_name: str) -> Response[str]:
 
 def find_available_port(start_port: int) -> int:
     port = start_port
-    while True:
-        with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
+    # A failed bind leaves the socket unbound, so one socket serves the whole
+    # scan instead of creating and closing a socket per rejected port.
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
+        while True:
             try:
                 s.bind(("127.0.0.1", port))
                 return port
@@ -57,14 +91,43 @@ def find_available_port(start_port: int) -> int:
                 port += 1
 
 
-def get_action_package_path(action_package_name: str) -> str:
-    home_directory = os.path.expanduser("~")
+def _write_file(file_path: str | Path, content: str) -> None:
+    # Write straight to the fd instead of building a buffered text wrapper
+    # for what is usually a single small payload.
+    data = memoryview(content.encode())
+    fd = os.open(
+        file_path,
+        os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, "O_BINARY", 0),
+        0o666,
+    )
+    try:
+        while data:
+            data = data[os.write(fd, data) :]
+    finally:
+        os.close(fd)
 
-    new_action_package_path = os.path.join(home_directory, "actions_bootstrapper")
 
-    full_action_path = os.path.join(new_action_package_path, action_package_name)
+def _read_file(file_path: str | Path) -> str:
+    # Read the whole file in one fstat-sized read rather than through the
+    # buffered text layer, which reads in chunks and grows the result.
+    fd = os.open(file_path, os.O_RDONLY | getattr(os, "O_BINARY", 0))
+    try:
+        remaining = os.fstat(fd).st_size
+        chunks = []
+        while remaining > 0:
+            chunk = os.read(fd, remaining)
+            if not chunk:
+                break
+            chunks.append(chunk)
+            remaining -= len(chunk)
+    finally:
+        os.close(fd)
+
+    return b"".join(chunks).decode()
 
-    return full_action_path
+
+def get_action_package_path(action_package_name: str) -> str:
+    return str(_BOOTSTRAP_ROOT / action_package_name)
 
 
 @action
@@ -84,18 +147,9 @@ def update_action_package_dependencies(
         A success message.
     """
 
-    package_yaml_path = os.path.join(
-        os.path.expanduser("~"),
-        "actions_bootstrapper",
-        action_package_name,
-        "package.yaml",
-    )
+    package_yaml_path = _BOOTSTRAP_ROOT / action_package_name / "package.yaml"
 
-    package_yaml = open(package_yaml_path, "w")
-    try:
-        package_yaml.write(action_package_dependencies_code)
-    finally:
-        package_yaml.close()
+    _write_file(package_yaml_path, action_package_dependencies_code)
 
     return Response(
         result=f"Successfully updated the package dependencies at: {package_yaml_path}"
@@ -130,17 +184,24 @@ def update_action_package_action_dev_data(
     file_name = f"input_{action_package_action_name}.json"
     file_path = os.path.join(dev_data_path, file_name)
 
-    with open(file_path, "w") as file:
-        try:
-            file.write(action_package_dev_data)
-        finally:
-            file.close()
+    _write_file(file_path, action_package_dev_data)
 
     return Response(
         result=f"dev data for {action_package_action_name} in the action package {action_package_name} successfully created!"
     )
 
 
+def _failure_report(process: subprocess.Popen, title: str) -> str:
+    stdout_content = process.stdout.read().decode() if process.stdout else ""
+    stderr_content = process.stderr.read().decode() if process.stderr else ""
+    print(title)
+    print("Stdout:")
+    print(stdout_content)
+    print("Stderr:")
+    print(stderr_content)
+    return f"{title}\n\nStdout:\n{stdout_content}\n\nStderr:\n{stderr_content}"
+
+
 @action
 def start_action_server(action_package_name: str, secrets: str) -> str:
     """
@@ -178,10 +239,27 @@ def start_action_server(action_package_name: str, secrets: str) -> str:
     ]
     print(f"Start command: {start_command}")
 
+    log_path = Path(full_action_path) / "action_server.log"
+    print(f"Log path: {log_path}")
+
+    # Remove the log of a previous run up front, so everything scanned below
+    # was written by the server started here. On Windows this fails while a
+    # server from that run still holds the log open.
+    try:
+        log_path.unlink(missing_ok=True)
+    except OSError as e:
+        print(f"Could not reset log file: {e}")
+        return f"Could not reset log file '{log_path}': {e}. Is an action server for this package still running?"
+
+    # Without close_fds, cwd or preexec_fn, CPython starts the launcher with
+    # posix_spawn rather than by forking this large process. Our own fds are
+    # non-inheritable, so the child does not need them closed. Windows keeps
+    # the default.
     process = subprocess.Popen(
         start_command,
         stdout=subprocess.PIPE,
         stderr=subprocess.PIPE,
+        close_fds=os.name == "nt",
         creationflags=subprocess.CREATE_NEW_PROCESS_GROUP if os.name == "nt" else 0,
     )
     print("Subprocess started.")
@@ -190,44 +268,61 @@ def start_action_server(action_package_name: str, secrets: str) -> str:
     start_time = time.time()
     url = f"http://localhost:{available_port}"
 
-    time.sleep(1.0)
-    log_path = Path(full_action_path) / "action_server.log"
-    print(f"Log path: {log_path}")
+    # The launcher script exits as soon as action-server is spawned, so wait for
+    # that instead of sleeping a fixed second, and bail out right away if the
+    # launcher itself failed (e.g. the secrets are not valid JSON).
+    try:
+        launcher_exit_code = process.wait(timeout=timeout)
+    except subprocess.TimeoutExpired:
+        launcher_exit_code = None
+    print(f"Launcher exit status: {launcher_exit_code}")
+
+    if launcher_exit_code:
+        return _failure_report(process, "Failed to start.")
+
+    # Keep the log open once it appears and only scan what was appended since
+    # the previous check, instead of re-opening and re-reading it every tick.
+    # The last few bytes are carried over so a marker split across reads is
+    # still found.
+    log_file = None
+    started_marker = url.encode()
+    error_marker = b"Error executing action-server"
+    overlap = max(len(started_marker), len(error_marker)) - 1
+    tail = b""
+
+    # Check often right after spawning, when the server usually comes up, and
+    # back off to the old one second tick for slow starts.
+    poll_interval = 0.05
+    max_poll_interval = 1.0
 
-    while True:
-        if time.time() - start_time > timeout:
-            stop_action_server(url)
-            stdout_content = process.stdout.read().decode() if process.stdout else ""
-            stderr_content = process.stderr.read().decode() if process.stderr else ""
-            print("Process timed out.")
-            print("Stdout:")
-            print(stdout_content)
-            print("Stderr:")
-            print(stderr_content)
-            return f"Process timed out.\n\nStdout:\n{stdout_content}\n\nStderr:\n{stderr_content}"
-        if log_path.exists():
-            with open(log_path, "r") as f:
-                lines = f.readlines()
-                for line in lines:
-                    if url in line:
-                        print(f"Action Server started at {url}")
-                        return f"Action Server started at {url}"
-                    if "Error executing action-server" in line:
-                        stdout_content = (
-                            process.stdout.read().decode() if process.stdout else ""
-                        )
-                        stderr_content = (
-                            process.stderr.read().decode() if process.stderr else ""
-                        )
-                        print("Failed to start.")
-                        print("Stdout:")
-                        print(stdout_content)
-                        print("Stderr:")
-                        print(stderr_content)
-                        return f"Failed to start.\n\nStdout:\n{stdout_content}\n\nStderr:\n{stderr_content}"
-        time.sleep(1.0)
-        print("Process exit status: {process.poll()}")
-        print("Checking log file...")
+    try:
+        while True:
+            if log_file is None and log_path.exists():
+                log_file = open(log_path, "rb")
+            if log_file is not None:
+                new_data = tail + log_file.read()
+                started_index = new_data.find(started_marker)
+                error_index = new_data.find(error_marker)
+                if started_index != -1 and (
+                    error_index == -1 or started_index < error_index
+                ):
+                    print(f"Action Server started at {url}")
+                    return f"Action Server started at {url}"
+                if error_index != -1:
+                    return _failure_report(process, "Failed to start.")
+                tail = new_data[-overlap:]
+            # Checked after the log so it is read at least once, even when the
+            # launcher took the whole timeout to exit
+            if time.time() - start_time > timeout:
+                stop_action_server(url)
+                return _failure_report(process, "Process timed out.")
+            time.sleep(poll_interval)
+            poll_interval = min(poll_interval * 2, max_poll_interval)
+            print(f"Process exit status: {process.poll()}")
+            print("Checking log file...")
+    finally:
+        if log_file is not None:
+            log_file.close()
 
 
 @action
@@ -262,6 +357,12 @@ def stop_action_server(action_server_url: str) -> str:
         return "Failed to stop the action server"
 
 
+@functools.lru_cache(maxsize=128)
+def _format_code(code: str) -> str:
+    # Agents often resubmit the same code while iterating, so keep recent results
+    return black.format_str(code, mode=black.FileMode())
+
+
 @action
 def update_action_code(action_package_name: str, action_code: str) -> Response[str]:
     """
@@ -276,20 +377,11 @@ def update_action_code(action_package_name: str, action_code: str) -> Response[s
     """
 
     # Format the code using black
-    formatted_code = black.format_str(action_code, mode=black.FileMode())
+    formatted_code = _format_code(action_code)
 
-    actions_py_path = os.path.join(
-        os.path.expanduser("~"),
-        "actions_bootstrapper",
-        action_package_name,
-        "actions.py",
-    )
+    actions_py_path = _BOOTSTRAP_ROOT / action_package_name / "actions.py"
 
-    actions_py = open(actions_py_path, "w")
-    try:
-        actions_py.write(formatted_code)
-    finally:
-        actions_py.close()
+    _write_file(actions_py_path, formatted_code)
 
     return Response(result=f"Successfully updated the actions at {actions_py_path}")
 
@@ -355,7 +447,7 @@ def get_action_run_logs(action_server_url: str, run_id: str) -> Response[str]:
 
     response = sema4ai_http.get(target_url)
 
-    payload = response.json()
+    payload = orjson.loads(response.data)
     output = payload[artifact]
 
     return Response(result=output)
@@ -376,8 +468,13 @@ def get_action_run_logs_latest(action_server_url: str) -> Response[str]:
 
     runs_list_url = urllib.parse.urljoin(action_server_url, "/api/runs")
 
-    runs_response = sema4ai_http.get(runs_list_url)
-    runs_payload = runs_response.json()
+    # /api/runs has no limit/order parameters, so the whole list comes back;
+    # ask for it compressed so the payload at least shrinks on the wire when
+    # the server (or a proxy in front of it) supports it.
+    runs_response = sema4ai_http.get(
+        runs_list_url, headers={"Accept-Encoding": "gzip"}
+    )
+    runs_payload = orjson.loads(runs_response.data)
 
     last_run = runs_payload[-1]
 
@@ -394,17 +491,11 @@ def get_file_contents(action_package_name: str, file_name: str = "actions.py") -
     Returns:
         Response with file contents or error if not found
     """
-    file_path = os.path.join(
-        os.path.expanduser("~"),
-        "actions_bootstrapper",
-        action_package_name,
-        file_name,
-    )
+    file_path = _BOOTSTRAP_ROOT / action_package_name / file_name
     if not os.path.exists(file_path):
         return Response(error=f"File not found: {file_path}")
     try:
-        with open(file_path, "r") as f:
-            contents = f.read()
+        contents = _read_file(file_path)
         return Response(result=contents)
     except Exception as e:
         return Response(error=f"Error reading file: {e}")
@@ -1,13 +1,54 @@
 import os
+import re
+import shutil
 import black
 import subprocess
-from typing import List
+import time
+from typing import List, Optional, Tuple
 from sema4ai.actions import Response, action
 
 
 
 
 
+def _execute(cmd: List[str], cwd: str = None) -> Tuple[Response[str], Optional[int]]:
+    """Run a validated command, returning its Response and return code (None if it could not start)"""
+    try:
+        # Combine stdout and stderr for better error reporting. The kernel merges
+        # both streams into one pipe, so the raw bytes are decoded once with no
+        # concatenation
+        result = subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, cwd=cwd)
+        output = result.stdout.decode(errors="replace")
+        if result.returncode != 0:
+            print(f"Command failed with return code {result.returncode}")
+            print(f"Command output: {output}")
+        return Response(result=output), result.returncode
+    except FileNotFoundError as e:
+        return Response(error=f"Command not found: {cmd[0]}. Make sure the command exists and is in your PATH. Error: {str(e)}"), None
+    except Exception as e:
+        return Response(error=f"Error executing command: {str(e)}"), None
+
+
+def _run_command(cmd: List[str], cwd: str = None) -> Response[str]:
+    """Validate and execute a command, returning its combined stdout and stderr"""
+    # Validate input parameters
+    if not cmd:
+        return Response(error="Command list cannot be empty")
+    
+    # Filter out empty strings from command list
+    cmd = [part for part in cmd if part.strip()]
+    
+    if not cmd:
+        return Response(error="Command list contains only empty strings")
+    
+    # Check if user accidentally passed a single string with spaces
+    if len(cmd) == 1 and ' ' in cmd[0]:
+        return Response(error=f"Command appears to contain spaces: '{cmd[0]}'. Please split into separate list items. For example: ['ls', '-la'] instead of ['ls -la']")
+    
+    response, _ = _execute(cmd, cwd=cwd)
+    return response
+
+
 @action
 def run_shell_command(cmd: List[str], cwd: str = None) -> Response[str]:
     """
@@ -23,43 +64,44 @@ def run_shell_command(cmd: List[str], cwd: str = None) -> Response[str]:
     Raises:
         subprocess.CalledProcessError: If command fails
     """
-    # Validate input parameters
-    if not cmd:
-        return Response(error="Command list cannot be empty")
-    
-    # Filter out empty strings from command list
-    cmd = [part for part in cmd if part.strip()]
-    
-    if not cmd:
-        return Response(error="Command list contains only empty strings")
-    
-    # Check if user accidentally passed a single string with spaces
-    if len(cmd) == 1 and ' ' in cmd[0]:
-        return Response(error=f"Command appears to contain spaces: '{cmd[0]}'. Please split into separate list items. For example: ['ls', '-la'] instead of ['ls -la']")
-    
-    try:
-        result = subprocess.run(cmd, capture_output=True, text=True, cwd=cwd)
-        # Combine stdout and stderr for better error reporting
-        output = result.stdout + result.stderr if result.stderr else result.stdout
-        try:
-            result.check_returncode()
-        except subprocess.CalledProcessError:
-            print(f"Command failed with return code {result.returncode}")
-            print(f"Command output: {output}")
-        return Response(result=output)
-    except FileNotFoundError as e:
-        return Response(error=f"Command not found: {cmd[0]}. Make sure the command exists and is in your PATH. Error: {str(e)}")
-    except Exception as e:
-        return Response(error=f"Error executing command: {str(e)}")
+    return _run_command(cmd, cwd=cwd)
 
 # Add a non-decorated version for internal use
 
 def _run(cmd: List[str], cwd: str = None) -> str:
-    """Internal helper function that calls run_shell_command and extracts the result"""
-    response = run_shell_command(cmd, cwd=cwd)
-    if hasattr(response, 'error') and response.error:
+    """Internal helper that runs the command directly, bypassing the action wrapper"""
+    return _unwrap(_run_command(cmd, cwd=cwd))
+
+
+def _unwrap(response: Response[str]) -> str:
+    if response.error:
         raise Exception(response.error)
-    return response.result if hasattr(response, 'result') else str(response)
+    return response.result
+
+
+# Output of static rcc commands (templates, docs, help), keyed on the command and
+# the mtime of the executable so an rcc upgrade invalidates it
+_RUN_CACHE = {}
+_RUN_CACHE_TTL_SEC = 600
+
+
+def _run_cached(cmd: List[str]) -> str:
+    """Like _run, but reuses the output of a successful run for a while"""
+    executable = shutil.which(cmd[0])
+    try:
+        key = (tuple(cmd), os.stat(executable).st_mtime if executable else None)
+    except OSError:
+        key = (tuple(cmd), None)
+
+    now = time.monotonic()
+    cached = _RUN_CACHE.get(key)
+    if cached is not None and now - cached[0] < _RUN_CACHE_TTL_SEC:
+        return cached[1]
+
+    response, returncode = _execute(cmd)
+    if returncode == 0:
+        _RUN_CACHE[key] = (now, response.result)
+    return _unwrap(response)
 
 
 # SCAFFOLDING & TEMPLATES ACTIONS 🦍
@@ -95,6 +137,11 @@ def create_robot(template: str, directory: str) -> Response[str]:
     else:
         return Response(error=f"Failed to create robot from template {template} here is the error: {output}")
 
+# Success patterns in `rcc pull` output, compiled once so the output is scanned in a single pass
+_PULL_SUCCESS_PATTERN = re.compile(
+    "|".join(re.escape(indicator) for indicator in ("OK.", "Flattening path", "extracted files"))
+)
+
 @action 
 def pull_robot(owner_repo: str, directory: str) -> Response[str]:
     """
@@ -112,13 +159,7 @@ def pull_robot(owner_repo: str, directory: str) -> Response[str]:
         print(f"Command output: {output}")
         
         # Check for specific success patterns in the output
-        success_indicators = [
-            "OK.",
-            "Flattening path",
-            "extracted files"
-        ]
-        
-        if any(indicator in output for indicator in success_indicators):
+        if _PULL_SUCCESS_PATTERN.search(output):
             return Response(result=f"Robot successfully pulled from {owner_repo} into {directory}. Details: {output}")
         else:
             return Response(error=f"Failed to pull robot from {owner_repo}. Output: {output}")
@@ -134,7 +175,7 @@ def list_templates() -> Response[str]:
     Returns:
         Response with list of available templates
     """
-    result = _run(["rcc", "robot", "initialize", "--list"])
+    result = _run_cached(["rcc", "robot", "initialize", "--list"])
     return Response(result=result)
 
 @action
@@ -149,7 +190,7 @@ def pull_template(repo_url: str, directory: str) -> Response[str]:
     Returns:
         Command output
     """
-    return _run(["rcc", "pull", repo_url, "-d", directory])
+    return Response(result=_run(["rcc", "pull", repo_url, "-d", directory]))
 
 @action
 def create_from_template(template: str, directory: str) -> Response[str]:
@@ -178,17 +219,17 @@ def run_robot(task_name: str, robot_path: str) -> Response[str]:
     Returns:
         Command output
     """
-    return _run(["rcc", "run", "-r", f"{robot_path}/robot.yaml"])
+    return Response(result=_run(["rcc", "run", "-r", f"{robot_path}/robot.yaml"]))
 
 @action
-def task_testrun() -> str:
+def task_testrun() -> Response[str]:
     """
     DO CLEAN TEST RUN!
     
     Returns:
         Test results output
     """
-    return _run(["rcc", "task", "testrun"])
+    return Response(result=_run(["rcc", "task", "testrun"]))
 
 # ROBOT-SCOPED ACTIONS 🍌
 @action
@@ -250,7 +291,7 @@ def unwrap_robot(artifact: str) -> Response[str]:
     Returns:
         Command output
     """
-    return _run(["rcc", "robot", "unwrap", "--artifact", artifact])
+    return Response(result=_run(["rcc", "robot", "unwrap", "--artifact", artifact]))
 
 # LOCAL EXECUTION ACTIONS 🦍
 
@@ -284,7 +325,7 @@ def list_tasks() -> Response[str]:
 
 
 @action
-def script_in_robot(command: str) -> str:
+def script_in_robot(command: str) -> Response[str]:
     """
     RUN COMMAND IN ROBOT HOME!
     
@@ -294,7 +335,7 @@ def script_in_robot(command: str) -> str:
     Returns:
         Command output
     """
-    return _run(["rcc", "run", "--", command])
+    return Response(result=_run(["rcc", "run", "--", command]))
 
 
 
@@ -307,7 +348,7 @@ def docs_list() -> Response[str]:
     Returns:
         Response with docs list
     """
-    result = _run(["rcc", "docs", "list"])
+    result = _run_cached(["rcc", "docs", "list"])
     return Response(result=result)
 
 @action
@@ -318,7 +359,7 @@ def docs_recipes() -> Response[str]:
     Returns:
         Response with recipes list
     """
-    result = _run(["rcc", "docs", "recipes"])
+    result = _run_cached(["rcc", "docs", "recipes"])
     return Response(result=result)
 
 @action
@@ -329,7 +370,7 @@ def docs_changelog() -> Response[str]:
     Returns:
         Response with changelog
     """
-    result = _run(["rcc", "docs", "changelog"])
+    result = _run_cached(["rcc", "docs", "changelog"])
     return Response(result=result)
 
 
@@ -343,7 +384,7 @@ def help() -> Response[str]:
     Returns:
         Response with the RCC CLI help output.
     """
-    result = _run(["rcc", "--help"])
+    result = _run_cached(["rcc", "--help"])
     return Response(result=result)
 
 @action